@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import functools
+import os
+import sqlite3
 import sys
 import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
-
-from PIL import Image
-from PySide6.QtCore import QItemSelectionModel, Qt, Signal
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import tifffile
+from PIL import Image, TiffImagePlugin
+from PySide6.QtCore import (
+    QItemSelectionModel,
+    QObject,
+    QRunnable,
+    QStandardPaths,
+    QThreadPool,
+    Signal,
+)
 from PySide6.QtGui import QDragEnterEvent, QDropEvent
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QApplication,
+    QCheckBox,
     QHBoxLayout,
     QListWidget,
-    QListWidgetItem,
     QMainWindow,
     QMessageBox,
     QPushButton,
@@ -35,6 +48,16 @@ TIFF_EXTENSIONS = {".tif", ".tiff"}
 DOCUWORKS_EXTENSIONS = {".xdw", ".xbd", ".xct"}
 SUPPORTED_EXTENSIONS = TIFF_EXTENSIONS | DOCUWORKS_EXTENSIONS
 
+OUTPUT_DPI = 400
+LOW_OUTPUT_DPI = 200
+
+# Pillow's TIFF decoders release the GIL, so TIFF pages decode in parallel.
+TIFF_DECODE_WORKERS = min(8, os.cpu_count() or 1)
+PAGE_COUNT_WORKERS = 8
+# Upper bound for decoded pages waiting on the writer (always at least one ahead).
+PREFETCH_BYTES = 256 * 1024 * 1024
+PAGE_COUNT_CACHE_NAME = "pagecount.sqlite"
+
 
 @dataclass
 class PageEntry:
@@ -47,6 +70,95 @@ class PageEntry:
         return f"{self.source_path.name}-p{self.page_index + 1:03d}"
 
 
+class PageCountCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._unavailable = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._unavailable:
+            try:
+                cache_dir = Path(
+                    QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+                )
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    str(cache_dir / PAGE_COUNT_CACHE_NAME), check_same_thread=False
+                )
+                # Losing a row on power failure only costs one re-probe.
+                conn.execute("PRAGMA synchronous = OFF")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS page_counts ("
+                    " path TEXT PRIMARY KEY,"
+                    " mtime_ns INTEGER NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " source_type TEXT NOT NULL,"
+                    " page_count INTEGER NOT NULL)"
+                )
+            except (OSError, sqlite3.Error):
+                self._unavailable = True
+                return None
+            self._conn = conn
+        return self._conn
+
+    def get(self, path: Path, stat: os.stat_result, source_type: str) -> Optional[int]:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT page_count FROM page_counts"
+                    " WHERE path = ? AND mtime_ns = ? AND size = ? AND source_type = ?",
+                    (str(path), stat.st_mtime_ns, stat.st_size, source_type),
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        return None if row is None else row[0]
+
+    def put(
+        self, path: Path, stat: os.stat_result, source_type: str, page_count: int
+    ) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO page_counts VALUES (?, ?, ?, ?, ?)",
+                        (
+                            str(path),
+                            stat.st_mtime_ns,
+                            stat.st_size,
+                            source_type,
+                            page_count,
+                        ),
+                    )
+            except sqlite3.Error:
+                pass
+
+
+PAGE_COUNT_CACHE = PageCountCache()
+
+
+def cached_page_count(source_type: str):
+    def decorator(func: Callable[[Path], int]) -> Callable[[Path], int]:
+        @functools.wraps(func)
+        def wrapper(path: Path) -> int:
+            stat = os.stat(path)
+            page_count = PAGE_COUNT_CACHE.get(path, stat, source_type)
+            if page_count is None:
+                page_count = func(path)
+                PAGE_COUNT_CACHE.put(path, stat, source_type, page_count)
+            return page_count
+
+        return wrapper
+
+    return decorator
+
+
 def extract_supported_paths_from_mime(mime_data) -> List[Path]:
     if not mime_data.hasUrls():
         return []
@@ -63,6 +175,97 @@ def extract_supported_paths_from_mime(mime_data) -> List[Path]:
     return paths
 
 
+@dataclass
+class RawGroup4Page:
+    width: int
+    height: int
+    photometric: int
+    fill_order: int
+    t6_options: Optional[int]
+    rows_per_strip: int
+    strips: List[bytes]
+
+
+def read_raw_group4_page(img: Image.Image) -> Optional[RawGroup4Page]:
+    tags = img.tag_v2
+    if (
+        img.mode != "1"
+        or tags.get(259) != 4  # Compression: CCITT Group 4
+        or tags.get(262) not in (0, 1)  # Photometric: WhiteIsZero / BlackIsZero
+        or 324 in tags  # TileOffsets
+        or 273 not in tags  # StripOffsets
+        or 279 not in tags  # StripByteCounts
+        # Pillow rotates decoded pages by Orientation; copied strips can't be.
+        or tags.get(274, 1) != 1
+    ):
+        return None
+
+    strips: List[bytes] = []
+    for offset, byte_count in zip(tags[273], tags[279]):
+        img.fp.seek(offset)
+        strip = img.fp.read(byte_count)
+        if len(strip) != byte_count:
+            return None
+        strips.append(strip)
+
+    # Stored dimensions; img.size is the displayed (possibly rotated) size.
+    width, height = tags[256], tags[257]
+    return RawGroup4Page(
+        width=width,
+        height=height,
+        photometric=tags[262],
+        fill_order=tags.get(266, 1),
+        t6_options=tags.get(293),
+        rows_per_strip=tags.get(278, height),
+        strips=strips,
+    )
+
+
+def write_raw_group4_page(page: RawGroup4Page, fp: IO[bytes], dpi: int) -> None:
+    # Lay the page out as Pillow's own TIFF writer does: header, IFD, then the
+    # strips. StripOffsets are relative and get shifted past the IFD by save().
+    ifd = TiffImagePlugin.ImageFileDirectory_v2(prefix=TiffImagePlugin.II)
+    ifd[256] = page.width  # ImageWidth
+    ifd[257] = page.height  # ImageLength
+    ifd[258] = 1  # BitsPerSample
+    ifd[259] = 4  # Compression
+    ifd[262] = page.photometric
+    if page.fill_order != 1:
+        ifd[266] = page.fill_order  # FillOrder
+    ifd[277] = 1  # SamplesPerPixel
+    ifd[278] = page.rows_per_strip
+    ifd[282] = dpi  # XResolution
+    ifd[283] = dpi  # YResolution
+    ifd[296] = 2  # ResolutionUnit: inch
+    if page.t6_options is not None:
+        ifd[293] = page.t6_options  # T6Options
+
+    strip_offsets: List[int] = []
+    position = 0
+    for strip in page.strips:
+        strip_offsets.append(position)
+        position += len(strip)
+    ifd[273] = tuple(strip_offsets)
+    ifd[279] = tuple(len(strip) for strip in page.strips)
+
+    ifd.save(fp)
+    for strip in page.strips:
+        fp.write(strip)
+
+
+def page_nbytes(page: Union[Image.Image, RawGroup4Page]) -> int:
+    if isinstance(page, RawGroup4Page):
+        return sum(len(strip) for strip in page.strips)
+    # Pillow keeps one byte per band per pixel, mode "1" included.
+    return page.width * page.height * len(page.getbands())
+
+
+def detach_frame(img: Image.Image) -> Image.Image:
+    # A copy owns its pixels, so the source handle can seek on or be closed.
+    img.load()
+    return img.copy()
+
+
 class PageListWidget(QListWidget):
     files_dropped = Signal(list)
 
@@ -94,6 +297,44 @@ class PageListWidget(QListWidget):
         event.ignore()
 
 
+class MergeSignals(QObject):
+    progress = Signal(int, int)
+    finished = Signal(str)
+    failed = Signal(str)
+
+
+class MergeTask(QRunnable):
+    def __init__(
+        self,
+        merge: Callable[..., None],
+        entries: List[PageEntry],
+        output_path: Path,
+        compression: str,
+        dpi: int,
+    ) -> None:
+        super().__init__()
+        self.merge = merge
+        self.entries = entries
+        self.output_path = output_path
+        self.compression = compression
+        self.dpi = dpi
+        self.signals = MergeSignals()
+
+    def run(self) -> None:
+        try:
+            self.merge(
+                self.entries,
+                self.output_path,
+                self.compression,
+                dpi=self.dpi,
+                progress=self.signals.progress.emit,
+            )
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+            return
+        self.signals.finished.emit(str(self.output_path))
+
+
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
@@ -105,6 +346,10 @@ class MainWindow(QMainWindow):
 
             self.setWindowIcon(QIcon(str(APP_ICON_PATH)))
 
+        self.merge_task: Optional[MergeTask] = None
+        # Kept in list order alongside page_list, which only holds the labels.
+        self.page_entries: List[PageEntry] = []
+
         self.page_list = PageListWidget()
         self.page_list.files_dropped.connect(self.add_files)
 
@@ -113,6 +358,12 @@ class MainWindow(QMainWindow):
         self.g4_button = QPushButton("G4形式で出力")
         self.lzw_button = QPushButton("LZW形式で出力")
         self.clear_button = QPushButton("クリア")
+        self.low_dpi_checkbox = QCheckBox(f"{LOW_OUTPUT_DPI}dpiで出力")
+        self.low_dpi_checkbox.setToolTip(
+            f"{OUTPUT_DPI}dpiの代わりに{LOW_OUTPUT_DPI}dpiで出力します。\n"
+            "ファイルサイズと処理時間は小さくなりますが、"
+            "細い線や小さな文字がつぶれることがあります。"
+        )
 
         self.up_button.clicked.connect(self.move_selected_up)
         self.down_button.clicked.connect(self.move_selected_down)
@@ -126,6 +377,7 @@ class MainWindow(QMainWindow):
         right_layout.addSpacing(24)
         right_layout.addWidget(self.g4_button)
         right_layout.addWidget(self.lzw_button)
+        right_layout.addWidget(self.low_dpi_checkbox)
         right_layout.addStretch(1)
         right_layout.addWidget(self.clear_button)
 
@@ -159,31 +411,44 @@ class MainWindow(QMainWindow):
         event.ignore()
 
     def add_files(self, paths: List[Path]) -> None:
+        if self.merge_task is not None:
+            return
         errors: List[str] = []
-        for path in paths:
-            ext = path.suffix.lower()
-            try:
-                if ext in TIFF_EXTENSIONS:
-                    page_count = self.get_tiff_page_count(path)
-                    source_type = "tiff"
-                elif ext in DOCUWORKS_EXTENSIONS:
-                    page_count = self.get_docuworks_page_count(path)
-                    source_type = "docuworks"
-                else:
+        new_entries: List[PageEntry] = []
+        with ThreadPoolExecutor(max_workers=PAGE_COUNT_WORKERS) as executor:
+            # TIFF headers are probed in parallel; xdwlib calls stay on this thread.
+            tiff_page_counts: Dict[Path, Future] = {
+                path: executor.submit(self.get_tiff_page_count, path)
+                for path in paths
+                if path.suffix.lower() in TIFF_EXTENSIONS
+            }
+            for path in paths:
+                ext = path.suffix.lower()
+                try:
+                    if ext in TIFF_EXTENSIONS:
+                        page_count = tiff_page_counts[path].result()
+                        source_type = "tiff"
+                    elif ext in DOCUWORKS_EXTENSIONS:
+                        page_count = self.get_docuworks_page_count(path)
+                        source_type = "docuworks"
+                    else:
+                        continue
+                except Exception as exc:
+                    errors.append(f"{path.name}: {exc}")
                     continue
-            except Exception as exc:
-                errors.append(f"{path.name}: {exc}")
-                continue
-
-            for page_index in range(page_count):
-                entry = PageEntry(
-                    source_path=path,
-                    page_index=page_index,
-                    source_type=source_type,
-                )
-                item = QListWidgetItem(entry.label)
-                item.setData(Qt.UserRole, entry)
-                self.page_list.addItem(item)
+
+                for page_index in range(page_count):
+                    new_entries.append(
+                        PageEntry(
+                            source_path=path,
+                            page_index=page_index,
+                            source_type=source_type,
+                        )
+                    )
+
+        # addItems inserts the whole drop as one batch of rows.
+        self.page_entries.extend(new_entries)
+        self.page_list.addItems([entry.label for entry in new_entries])
 
         if errors:
             QMessageBox.warning(
@@ -193,11 +458,14 @@ class MainWindow(QMainWindow):
             )
 
     @staticmethod
+    @cached_page_count("tiff")
     def get_tiff_page_count(path: Path) -> int:
-        with Image.open(path) as img:
-            return getattr(img, "n_frames", 1)
+        # tifffile only follows the IFD chain; Pillow parses every IFD to count.
+        with tifffile.TiffFile(path) as tf:
+            return len(tf.pages)
 
     @staticmethod
+    @cached_page_count("docuworks")
     def get_docuworks_page_count(path: Path) -> int:
         with xdwopen(str(path), readonly=True) as doc:
             return doc.pages
@@ -215,6 +483,8 @@ class MainWindow(QMainWindow):
             if row in selected_set and (row - 1) not in selected_set:
                 item = self.page_list.takeItem(row)
                 self.page_list.insertItem(row - 1, item)
+                entries = self.page_entries
+                entries[row - 1], entries[row] = entries[row], entries[row - 1]
                 selected_set.remove(row)
                 selected_set.add(row - 1)
                 moved = True
@@ -235,6 +505,8 @@ class MainWindow(QMainWindow):
             if row in selected_set and (row + 1) not in selected_set:
                 item = self.page_list.takeItem(row)
                 self.page_list.insertItem(row + 1, item)
+                entries = self.page_entries
+                entries[row], entries[row + 1] = entries[row + 1], entries[row]
                 selected_set.remove(row)
                 selected_set.add(row + 1)
                 moved = True
@@ -255,27 +527,58 @@ class MainWindow(QMainWindow):
         self.page_list.setCurrentRow(focus_row, QItemSelectionModel.NoUpdate)
 
     def export_tiff(self, compression: str) -> None:
+        if self.merge_task is not None:
+            return
         if self.page_list.count() == 0:
             self.statusBar().showMessage("出力対象のページがありません。", 5000)
             return
 
         entries = self.collect_entries()
         output_path = self.build_auto_output_path(entries)
-        try:
-            self.create_merged_tiff(entries, output_path, compression)
-        except Exception as exc:
-            self.statusBar().showMessage(f"TIFF出力に失敗: {exc}", 10000)
-            return
+        dpi = LOW_OUTPUT_DPI if self.low_dpi_checkbox.isChecked() else OUTPUT_DPI
+        task = MergeTask(
+            self.create_merged_tiff, entries, output_path, compression, dpi
+        )
+        task.signals.progress.connect(self.on_merge_progress)
+        task.signals.finished.connect(self.on_merge_finished)
+        task.signals.failed.connect(self.on_merge_failed)
 
+        self.merge_task = task
+        self.set_controls_enabled(False)
+        self.statusBar().showMessage("TIFF出力中...")
+        QThreadPool.globalInstance().start(task)
+
+    def on_merge_progress(self, done: int, total: int) -> None:
+        self.statusBar().showMessage(f"TIFF出力中... ({done}/{total})")
+
+    def on_merge_finished(self, output_path: str) -> None:
+        self.merge_task = None
+        self.set_controls_enabled(True)
         self.statusBar().showMessage(f"出力完了: {output_path}", 10000)
 
+    def on_merge_failed(self, message: str) -> None:
+        self.merge_task = None
+        self.set_controls_enabled(True)
+        self.statusBar().showMessage(f"TIFF出力に失敗: {message}", 10000)
+
+    def set_controls_enabled(self, enabled: bool) -> None:
+        for button in (
+            self.up_button,
+            self.down_button,
+            self.g4_button,
+            self.lzw_button,
+            self.low_dpi_checkbox,
+            self.clear_button,
+        ):
+            button.setEnabled(enabled)
+        # A drop would probe DocuWorks files on this thread while the merge is
+        # using xdwlib on its own; xdwlib is not thread-safe.
+        self.page_list.setAcceptDrops(enabled)
+        self.setAcceptDrops(enabled)
+
     def collect_entries(self) -> List[PageEntry]:
-        entries: List[PageEntry] = []
-        for row in range(self.page_list.count()):
-            item = self.page_list.item(row)
-            entry = item.data(Qt.UserRole)
-            entries.append(entry)
-        return entries
+        # A copy, so the merge thread never shares the list with the GUI.
+        return list(self.page_entries)
 
     @staticmethod
     def build_auto_output_path(entries: List[PageEntry]) -> Path:
@@ -286,6 +589,7 @@ class MainWindow(QMainWindow):
 
     def clear_page_list(self) -> None:
         self.page_list.clear()
+        self.page_entries.clear()
         self.statusBar().showMessage("リストをクリアしました。", 5000)
 
     def create_merged_tiff(
@@ -293,57 +597,206 @@ class MainWindow(QMainWindow):
         entries: List[PageEntry],
         output_path: Path,
         compression: str,
+        dpi: int = OUTPUT_DPI,
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> None:
-        frames: List[Image.Image] = []
-        xdw_docs: Dict[Path, object] = {}
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            try:
-                for order, entry in enumerate(entries):
-                    if entry.source_type == "tiff":
-                        frame = self.load_tiff_page(entry.source_path, entry.page_index)
-                    else:
-                        frame = self.convert_docuworks_page(
-                            entry=entry,
-                            order=order,
-                            temp_dir=Path(temp_dir),
-                            opened_docs=xdw_docs,
-                        )
-
-                    if compression == "group4":
-                        frame = self.ensure_group4_mode(frame)
-                    frames.append(frame)
-            finally:
-                for doc in xdw_docs.values():
-                    doc.close()
-
-        if not frames:
+        if not entries:
             raise RuntimeError("出力対象のページがありません。")
 
-        first, *rest = frames
-        first.save(
-            output_path,
-            format="TIFF",
-            save_all=True,
-            append_images=rest,
-            compression=compression,
-            dpi=(400, 400),
+        xdw_docs: Dict[Path, object] = {}
+        tiff_images: Dict[Tuple[int, Path], Image.Image] = {}
+
+        # Write next to the target and swap it in at the end: the target may be
+        # one of the sources (re-merging an earlier _mrg.tif), so it must not be
+        # touched until every source handle is closed.
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f"{output_path.stem}_", suffix=".tmp", dir=output_path.parent
         )
+        os.close(fd)
+        temp_output = Path(temp_name)
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                tiff_executor = ThreadPoolExecutor(max_workers=TIFF_DECODE_WORKERS)
+                # A single worker keeps every xdwlib call serial; it is not thread-safe.
+                xdw_executor = ThreadPoolExecutor(max_workers=1)
+                try:
+                    frames = self.iter_frames(
+                        entries=entries,
+                        compression=compression,
+                        dpi=dpi,
+                        tiff_executor=tiff_executor,
+                        xdw_executor=xdw_executor,
+                        temp_dir=Path(temp_dir),
+                        opened_docs=xdw_docs,
+                        opened_images=tiff_images,
+                    )
+                    self.write_tiff_pages(
+                        frames, temp_output, compression, dpi, len(entries), progress
+                    )
+                finally:
+                    tiff_executor.shutdown(cancel_futures=True)
+                    xdw_executor.shutdown(cancel_futures=True)
+                    for doc in xdw_docs.values():
+                        doc.close()
+                    for img in tiff_images.values():
+                        img.close()
+            os.replace(temp_output, output_path)
+        except BaseException:
+            temp_output.unlink(missing_ok=True)
+            raise
+
+    def iter_frames(
+        self,
+        entries: List[PageEntry],
+        compression: str,
+        dpi: int,
+        tiff_executor: ThreadPoolExecutor,
+        xdw_executor: ThreadPoolExecutor,
+        temp_dir: Path,
+        opened_docs: Dict[Path, object],
+        opened_images: Dict[Tuple[int, Path], Image.Image],
+    ) -> Iterator[Union[Image.Image, RawGroup4Page]]:
+        # Pages are prepared on the executors ahead of the writer, so decoding
+        # overlaps encoding. How far ahead depends on the largest page seen so
+        # far, keeping the prefetched pages within PREFETCH_BYTES.
+        pending: Dict[int, Future] = {}
+        submitted = 0
+        largest_page = 0
+        last_use = {
+            entry.source_path: order
+            for order, entry in enumerate(entries)
+            if entry.source_type == "tiff"
+        }
+        for order in range(len(entries)):
+            lookahead = 2
+            if largest_page:
+                pages_in_budget = PREFETCH_BYTES // largest_page
+                lookahead = max(2, min(TIFF_DECODE_WORKERS, pages_in_budget))
+            lookahead_end = min(order + lookahead, len(entries))
+            while submitted < lookahead_end:
+                entry = entries[submitted]
+                if entry.source_type == "tiff":
+                    executor = tiff_executor
+                else:
+                    executor = xdw_executor
+                pending[submitted] = executor.submit(
+                    self.load_frame,
+                    entry=entry,
+                    order=submitted,
+                    compression=compression,
+                    dpi=dpi,
+                    temp_dir=temp_dir,
+                    opened_docs=opened_docs,
+                    opened_images=opened_images,
+                )
+                submitted += 1
+
+            frame = pending.pop(order).result()
+            largest_page = max(largest_page, page_nbytes(frame))
+            path = entries[order].source_path
+            if last_use.get(path) == order:
+                # Every page of this file is loaded (results arrive in order),
+                # so each worker's handle on it can go now, not at the end.
+                for key in list(opened_images):
+                    if key[1] == path:
+                        opened_images.pop(key).close()
+            yield frame
+
+    def load_frame(
+        self,
+        entry: PageEntry,
+        order: int,
+        compression: str,
+        dpi: int,
+        temp_dir: Path,
+        opened_docs: Dict[Path, object],
+        opened_images: Dict[Tuple[int, Path], Image.Image],
+    ) -> Union[Image.Image, RawGroup4Page]:
+        if entry.source_type == "tiff":
+            # Group 4 sources are copied strip for strip when nothing is resampled.
+            frame = self.load_tiff_page(
+                entry,
+                opened_images,
+                copy_group4=compression == "group4" and dpi == OUTPUT_DPI,
+            )
+            # The default merge keeps source pixels as they are; only the 200 dpi
+            # option resamples.
+            if isinstance(frame, Image.Image) and dpi != OUTPUT_DPI:
+                frame = self.downscale_frame(frame, dpi)
+        else:
+            # For Group 4 output DocuWorks renders bilevel pages directly, which
+            # skips the 24-bit export and the conversion to mode "1".
+            frame = self.convert_docuworks_page(
+                entry=entry,
+                order=order,
+                temp_dir=temp_dir,
+                opened_docs=opened_docs,
+                dpi=dpi,
+                color="MONO" if compression == "group4" else "COLOR",
+            )
 
-        for frame in frames:
-            frame.close()
+        if compression == "group4" and isinstance(frame, Image.Image):
+            frame = self.ensure_group4_mode(frame)
+        return frame
 
     @staticmethod
-    def load_tiff_page(path: Path, page_index: int) -> Image.Image:
-        with Image.open(path) as img:
-            max_index = getattr(img, "n_frames", 1) - 1
-            if page_index > max_index:
-                raise IndexError(
-                    f"ページ {page_index + 1} は存在しません。"
-                    f" ({path.name}: 1..{max_index + 1})"
-                )
-            img.seek(page_index)
-            return img.copy()
+    def write_tiff_pages(
+        frames: Iterable[Union[Image.Image, RawGroup4Page]],
+        output_path: Path,
+        compression: str,
+        dpi: int,
+        total: int,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        # Same per-page loop as Pillow's save_all, but each page is encoded and
+        # released before the next one is pulled, instead of holding all pages.
+        # tifffile can't write CCITT-compressed bilevel pages, so libtiff via
+        # Pillow stays the encoder for both output formats.
+        written = 0
+        with TiffImagePlugin.AppendingTiffWriter(str(output_path), new=True) as tf:
+            for frame in frames:
+                if isinstance(frame, RawGroup4Page):
+                    write_raw_group4_page(frame, tf, dpi)
+                    tf.newFrame()
+                else:
+                    frame.save(
+                        tf,
+                        format="TIFF",
+                        compression=compression,
+                        dpi=(dpi, dpi),
+                    )
+                    tf.newFrame()
+                    frame.close()
+
+                written += 1
+                if progress is not None:
+                    progress(written, total)
+
+    @staticmethod
+    def load_tiff_page(
+        entry: PageEntry,
+        opened_images: Dict[Tuple[int, Path], Image.Image],
+        copy_group4: bool = False,
+    ) -> Union[Image.Image, RawGroup4Page]:
+        # One handle per decode thread and file: a handle can only seek for one reader.
+        key = (threading.get_ident(), entry.source_path)
+        img = opened_images.get(key)
+        if img is None:
+            img = Image.open(entry.source_path)
+            opened_images[key] = img
+
+        max_index = getattr(img, "n_frames", 1) - 1
+        if entry.page_index > max_index:
+            raise IndexError(
+                f"ページ {entry.page_index + 1} は存在しません。"
+                f" ({entry.source_path.name}: 1..{max_index + 1})"
+            )
+        img.seek(entry.page_index)
+        if copy_group4:
+            raw_page = read_raw_group4_page(img)
+            if raw_page is not None:
+                return raw_page
+        return detach_frame(img)
 
     @staticmethod
     def convert_docuworks_page(
@@ -351,6 +804,8 @@ class MainWindow(QMainWindow):
         order: int,
         temp_dir: Path,
         opened_docs: Dict[Path, object],
+        dpi: int = OUTPUT_DPI,
+        color: str = "COLOR",
     ) -> Image.Image:
         doc = opened_docs.get(entry.source_path)
         if doc is None:
@@ -360,18 +815,47 @@ class MainWindow(QMainWindow):
         temp_tiff = temp_dir / f"docuworks_{order:05d}.tif"
         doc.page(entry.page_index).export_image(
             path=str(temp_tiff),
-            dpi=400,
+            dpi=dpi,
+            color=color,
             format="TIFF",
             compress="NOCOMPRESS",
         )
 
-        with Image.open(temp_tiff) as img:
-            return img.copy()
+        # xdwlib can only export to a file path, so keep at most one page on disk.
+        try:
+            with Image.open(temp_tiff) as img:
+                return detach_frame(img)
+        finally:
+            temp_tiff.unlink(missing_ok=True)
+
+    @staticmethod
+    def downscale_frame(img: Image.Image, dpi: int) -> Image.Image:
+        source_dpi = img.info.get("dpi")
+        if not source_dpi or not all(source_dpi):
+            # Sources without a usable resolution are taken to be OUTPUT_DPI scans.
+            source_dpi = (OUTPUT_DPI, OUTPUT_DPI)
+        size = (
+            max(1, round(img.width * dpi / source_dpi[0])),
+            max(1, round(img.height * dpi / source_dpi[1])),
+        )
+        if size[0] >= img.width and size[1] >= img.height:
+            return img
+        # Pillow only resizes "1" and "P" images with nearest neighbour.
+        if img.mode == "1":
+            # Resample in gray, then threshold back so bilevel sources stay
+            # bilevel (and small) in LZW output too.
+            resized = img.convert("L").resize(size, Image.LANCZOS)
+            return MainWindow.ensure_group4_mode(resized)
+        if img.mode == "P":
+            img = img.convert("RGB")
+        return img.resize(size, Image.LANCZOS)
 
     @staticmethod
     def ensure_group4_mode(img: Image.Image) -> Image.Image:
         if img.mode == "1":
             return img
+        # Without dithering this is a single C threshold pass at 128, which
+        # beats a NumPy threshold + packbits round trip.
         dither_enum = getattr(Image, "Dither", None)
         if dither_enum is not None:
             return img.convert("1", dither=Image.Dither.NONE)
@@ -380,6 +864,7 @@ class MainWindow(QMainWindow):
 
 def main() -> int:
     app = QApplication(sys.argv)
+    app.setApplicationName("DTMerger")
     if APP_ICON_PATH.exists():
         from PySide6.QtGui import QIcon
 